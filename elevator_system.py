@@ -2,23 +2,45 @@
 # This code simulates a multi-elevator system in a building with multiple floors.
 # The system handles elevator requests, manages elevator movement, and tracks elevator states.
 # Problem statement: https://codezym.com/question/11
+# The module is fully type-annotated so it can be compiled as-is with mypyc (`mypyc elevator_system.py`).
 
-from collections import defaultdict, deque
+from __future__ import annotations
+
+from array import array
+from heapq import heapify, heappop, heappush
+
+# Movement directions. Integers keep the hot comparisons cheap and let a moving
+# lift step with `current_floor += direction`.
+UP, DOWN, IDLE = 1, -1, 0
+
+# Translation between the external 'U'/'D'/'I' codes and the direction constants
+DIRECTION_CODES = {'U': UP, 'D': DOWN}
+DIRECTION_CHARS = {UP: 'U', DOWN: 'D', IDLE: 'I'}
+
+# Lift state ids, used to index the per-state dispatch tables defined after the state classes
+IDLE_ID, MOVING_UP_ID, MOVING_DOWN_ID, UP_PICK_FIRST_ID, DOWN_PICK_FIRST_ID = range(5)
 
 class Solution:
     """
     Main controller class for the elevator system that manages all lifts and user requests.
     Acts as the central coordinator between user requests and individual elevator operations.
     """
-    def __init__(self):
+    def __init__(self) -> None:
         # Initialize basic system parameters
-        self.floors_count = 0  # Total number of floors in the building
-        self.lifts_count = 0   # Total number of lifts/elevators available
-        self.lifts_capacity = 0  # Maximum capacity of each lift (number of people)
-        self.helper = None  # Helper utility for output/logging (not used in this example)
-        self.lifts = []  # List to store all lift objects
-
-    def init(self, floors, lifts, lifts_capacity, helper):
+        self.floors_count: int = 0  # Total number of floors in the building
+        self.lifts_count: int = 0   # Total number of lifts/elevators available
+        self.lifts_capacity: int = 0  # Maximum capacity of each lift (number of people)
+        self.balance_weight: int = 0  # Extra ticks charged per passenger aboard when picking a lift
+        self.helper: object = None  # Helper utility for output/logging (not used in this example)
+        self.lifts: list[Lift] = []  # List to store all lift objects
+        self._idle_count: int = 0  # Number of lifts currently idle, kept up to date by the lifts
+        # Per (floor, direction) index of candidate lifts, kept only until the next tick.
+        # None after the first request for a key; from the second on, a heap of
+        # (score, lift index, lift state version) and how much of _dirty it has seen
+        self._eta_index: dict[tuple[int, int], tuple[list[tuple[int, int, int]], int] | None] = {}
+        self._dirty: list[int] = []  # Indices of lifts changed since the last tick
+
+    def init(self, floors: int, lifts: int, lifts_capacity: int, helper: object, balance_weight: int = 0) -> None:
         """
         Initializes the elevator system with the specified parameters.
         Args:
@@ -26,16 +48,23 @@ class Solution:
             lifts (int): The number of lifts in the system.
             lifts_capacity (int): The maximum number of people per lift.
             helper (Helper11): Helper class for printing and other actions.
+            balance_weight (int): Penalty added to a lift's pickup time per passenger aboard.
+                0 (default) picks purely by time; e.g. lifts_capacity // 4 spreads requests
+                across lifts so fewer calls get rejected once lifts fill up.
         """
         self.floors_count = floors
         self.lifts_count = lifts
         self.lifts_capacity = lifts_capacity
+        self.balance_weight = balance_weight
         self.helper = helper
         # Create lift objects based on the specified count
-        self.lifts = [Lift(floors, lifts_capacity) for _ in range(lifts)]
+        self.lifts = [Lift(floors, lifts_capacity, self) for _ in range(lifts)]
+        self._idle_count = lifts  # Every lift starts idle
+        self._eta_index = {}
+        self._dirty = []
         # self.helper.println("Lift system initialized ...")
 
-    def request_lift(self, floor, direction):
+    def request_lift(self, floor: int, direction: str) -> int:
         """
         Handles a user pressing the UP or DOWN button outside the lift.
         This method finds the most optimal lift to send to the requested floor.
@@ -47,30 +76,99 @@ class Solution:
         Returns:
             int: Index of the selected lift or -1 if no lift is available.
         """
-        lift_index = -1  # Default to -1 (no lift available)
-        time_taken = -1  # Initialize time with -1 (no valid time yet)
-        
-        # Iterate through all lifts to find the optimal one
-        for i, lift in enumerate(self.lifts):
-            # Get estimated time for this lift to reach the requested floor
-            time = lift.get_time_to_reach_floor(floor, direction)
+        # No lift can pick anyone up outside the building
+        if not 0 <= floor < self.floors_count:
+            return -1
             
-            # Skip this lift if it can't serve this request (-1) or is already at capacity
-            if time < 0 or lift.count_people(floor, direction) >= self.lifts_capacity:
-                continue
-                
-            # Select this lift if it's the first valid one or faster than previously selected
-            if time_taken < 0 or time < time_taken:
-                time_taken = time
-                lift_index = i
+        move_direction = DIRECTION_CODES[direction]
+        lift_index = self._find_best_lift(floor, move_direction)
                 
         # If a suitable lift was found, add the request to that lift
         if lift_index >= 0:
-            self.lifts[lift_index].add_incoming_request(floor, direction)
+            self.lifts[lift_index].add_incoming_request(floor, move_direction)
+            self._dirty.append(lift_index)
             
         return lift_index
 
-    def press_floor_button_in_lift(self, lift_index, floor):
+    def _find_best_lift(self, floor: int, direction: int) -> int:
+        """
+        Finds the lift with the lowest score for a request in the given direction,
+        where score = pickup time + balance_weight * people aboard.
+        Ties go to the lowest lift index.
+        
+        Every tick moves the lifts and changes their times, so the first request for a
+        floor and direction after a tick simply scans all lifts. Only a repeat within the
+        same tick (a burst) builds a heap, after which just the lifts changed since are
+        re-evaluated and entries left behind by those changes are dropped lazily.
+        
+        Args:
+            floor (int): The floor where the request is made.
+            direction (int): Requested direction (UP or DOWN).
+        
+        Returns:
+            int: Index of the selected lift or -1 if no lift is available.
+        """
+        lifts = self.lifts
+        
+        # Fast path when every lift is idle: any lift can serve the request, the time is just
+        # the distance and the directional people count is 0, so only the distance (plus the
+        # balance penalty) decides. min() keeps the lowest index on ties.
+        if lifts and self._idle_count == len(lifts) and self.lifts_capacity > 0:
+            weight = self.balance_weight
+            return min(
+                range(len(lifts)),
+                key=lambda i: abs(floor - lifts[i].current_floor) + weight * lifts[i]._people_total,
+            )
+            
+        index = self._eta_index
+        key = (floor, direction)
+        # Bind the unbound method once to skip the attribute lookup per lift
+        get_pickup_time = Lift.get_pickup_time
+        balance_weight = self.balance_weight
+        
+        if key not in index:
+            index[key] = None
+            lift_index = -1  # Default to -1 (no lift available)
+            best_score: int | None = None  # No valid score yet (a negative weight can make scores negative)
+            for i, lift in enumerate(lifts):
+                # Get estimated time for this lift to pick up at the requested floor,
+                # -1 if it can't serve this request or would be full on arrival
+                time = get_pickup_time(lift, floor, direction)
+                if time < 0:
+                    continue
+                score = time + balance_weight * lift._people_total
+                # Select this lift if it's the first valid one or scores lower than previously selected
+                if best_score is None or score < best_score:
+                    best_score = score
+                    lift_index = i
+            return lift_index
+            
+        dirty = self._dirty
+        entry = index[key]
+        if entry is None:
+            # Second request for this key in the same tick: index every lift
+            heap = []
+            for i, lift in enumerate(lifts):
+                time = get_pickup_time(lift, floor, direction)
+                if time >= 0:
+                    heap.append((time + balance_weight * lift._people_total, i, lift._state_version))
+            heapify(heap)
+        else:
+            # Re-evaluate only the lifts that changed since this key was last requested
+            heap, seen = entry
+            for i in dirty[seen:]:
+                lift = lifts[i]
+                time = get_pickup_time(lift, floor, direction)
+                if time >= 0:
+                    heappush(heap, (time + balance_weight * lift._people_total, i, lift._state_version))
+        index[key] = (heap, len(dirty))
+        
+        # Entries pushed for an older version of their lift are stale
+        while heap and heap[0][2] != lifts[heap[0][1]]._state_version:
+            heappop(heap)
+        return heap[0][1] if heap else -1
+
+    def press_floor_button_in_lift(self, lift_index: int, floor: int) -> None:
         """
         Simulates a user pressing a floor button inside the lift.
         This registers where the person inside the lift wants to go.
@@ -82,9 +180,11 @@ class Solution:
         lift = self.lifts[lift_index]
         # Add the destination floor to the lift's outgoing requests
         # Using the lift's current direction since the passenger is already inside
-        lift.add_outgoing_request(floor, lift.get_move_direction())
+        lift.add_outgoing_request(floor, STATE_DIRECTIONS[lift.state_id])
+        if self._eta_index:
+            self._dirty.append(lift_index)
 
-    def get_lift_state(self, lift_index):
+    def get_lift_state(self, lift_index: int) -> str:
         """
         Returns the current state of the lift as a formatted string.
         Format: "current_floor-direction-people_count"
@@ -98,16 +198,44 @@ class Solution:
         if lift_index < 0 or lift_index >= len(self.lifts):
             return ""  # Return empty string for invalid lift index
         lift = self.lifts[lift_index]
-        return f"{lift.get_current_floor()}-{lift.get_move_direction()}-{lift.get_current_people_count()}"
+        # Reuse the last string while the lift's state is unchanged
+        if lift._state_string_version != lift._state_version:
+            lift._state_string = (
+                str(lift.current_floor) + "-" + DIRECTION_CHARS[STATE_DIRECTIONS[lift.state_id]] + "-" + str(lift._people_total)
+            )
+            lift._state_string_version = lift._state_version
+        return lift._state_string
 
-    def tick(self):
+    def tick(self) -> None:
         """
         Advances the system time by one second.
         This method is called every second to update all lift positions and states.
         """
+        self._end_burst()
         # Update each lift's state for the next time unit
+        tick = Lift.tick
         for lift in self.lifts:
-            lift.tick()
+            tick(lift)
+
+    def tick_many(self, ticks: int) -> None:
+        """
+        Advances the system time by the given number of seconds.
+        Equivalent to calling tick() that many times, but lifts don't interact
+        while time passes, so each lift is run through all its ticks in one go
+        and stops early once it goes idle.
+        
+        Args:
+            ticks (int): Number of time units to advance.
+        """
+        self._end_burst()
+        for lift in self.lifts:
+            lift.advance(ticks)
+
+    def _end_burst(self) -> None:
+        """Drops the per-tick lift index before time moves on"""
+        if self._eta_index:
+            self._eta_index.clear()
+            self._dirty.clear()
 
 class Lift:
     """
@@ -115,57 +243,93 @@ class Lift:
     Manages its own state, position, and passenger requests.
     Uses the State pattern to handle different movement behaviors.
     """
-    def __init__(self, floors, capacity):
-        self.current_floor = 0  # Start at ground floor
-        self.floors = floors  # Total number of floors in the building
-        self.capacity = capacity  # Maximum number of people this lift can carry
+    def __init__(self, floors: int, capacity: int, controller: Solution | None = None) -> None:
+        self.current_floor: int = 0  # Start at ground floor
+        self.floors: int = floors  # Total number of floors in the building
+        self.capacity: int = capacity  # Maximum number of people this lift can carry
+        self.controller: Solution | None = controller  # Told when the lift enters or leaves idle
         
         # Track pickup requests (where people are waiting)
-        self.incoming_requests_count = set()  # Floors where people are waiting
+        # Bitset of floors where people are waiting: bit f is set if floor f has a pickup
+        self.incoming_requests_count: int = 0
         
         # Track dropoff requests (where people inside want to go)
-        # Key: floor number, Value: number of people going to that floor
-        self.outgoing_requests_count = defaultdict(int)
+        # Index: floor number, Value: number of people going to that floor
+        self.outgoing_requests_count: array[int] = array('i', [0] * floors)
+        self._people_total: int = 0  # Running sum of outgoing_requests_count values
+        # Fenwick tree over outgoing_requests_count for O(log F) directional people counts
+        self._bit: array[int] = array('i', [0] * (floors + 1))
         
-        # Create state objects for the different possible states of the lift
-        self.moving_up_state = MovingUpState(self)  # Moving upward normally
-        self.moving_down_state = MovingDownState(self)  # Moving downward normally
-        self.idle_state = IdleState(self)  # Not moving, waiting for requests
-        self.moving_up_to_pick_first = MovingUpToPickFirstState(self)  # Going up to get first passenger
-        self.moving_down_to_pick_first = MovingDownToPickFirstState(self)  # Going down to get first passenger
+        # Start in idle state. States are shared by all lifts and receive the lift on every call;
+        # the lift only stores the state's id and dispatches through the tables below.
+        self.state_id: int = IDLE_ID
+        # Pickup floor the pick-first states are heading to (highest when going up,
+        # lowest when going down), -1 if none
+        self.pick_target: int = -1
         
-        # Start in idle state
-        self.state = self.idle_state
+        # Bumped on every change to the lift's floor, state or requests
+        self._state_version: int = 0
+        # Last get_lift_state string and the state version it was built for
+        self._state_string: str = ""
+        self._state_string_version: int = -1
 
-    def get_current_people_count(self):
-        """Returns total number of people currently in the lift"""
-        # Sum all people going to various floors
-        return sum(self.outgoing_requests_count.values())
+    @property
+    def state(self) -> LiftState:
+        """The shared state object the lift is currently in"""
+        return STATES[self.state_id]
 
-    def get_time_to_reach_floor(self, floor, direction):
+    @property
+    def people_count(self) -> int:
+        """Total number of people currently in the lift"""
+        return self._people_total
+
+    def get_time_to_reach_floor(self, floor: int, direction: int) -> int:
         """
         Estimates time (in ticks) for this lift to reach a specific floor.
         Delegates to the current state to calculate based on current movement pattern.
         
         Args:
             floor (int): Target floor
-            direction (str): Requested direction ('U' or 'D')
+            direction (int): Requested direction (UP or DOWN)
             
         Returns:
             int: Estimated time units or -1 if lift cannot service this request
         """
-        return self.state.get_time_to_reach_floor(floor, direction)
+        return TIME_FNS[self.state_id](self, floor, direction)
+
+    def get_pickup_time(self, floor: int, direction: int) -> int:
+        """
+        Combines the ETA and capacity checks used when scheduling an external request,
+        so the controller needs a single call per lift.
+        
+        Args:
+            floor (int): Floor where the request is made
+            direction (int): Requested direction (UP or DOWN)
+            
+        Returns:
+            int: Estimated time units, or -1 if the lift cannot service this request
+                 or would already be full when it reaches the floor
+        """
+        state_id = self.state_id
+        time = TIME_FNS[state_id](self, floor, direction)
+        if time < 0:
+            return -1
+        # The directional count can never exceed the total on board,
+        # so it only needs computing once the total reaches capacity
+        if self._people_total >= self.capacity and COUNT_FNS[state_id](self, floor, direction) >= self.capacity:
+            return -1
+        return time
 
-    def add_incoming_request(self, floor, direction):
+    def add_incoming_request(self, floor: int, direction: int) -> None:
         """
         Registers a pickup request (someone waiting at a floor).
         
         Args:
             floor (int): Floor where person is waiting
-            direction (str): Direction they want to go ('U' or 'D')
+            direction (int): Direction they want to go (UP or DOWN)
         """
         # If lift is idle, determine new state based on request
-        if self.state.get_direction() == 'I':
+        if self.state_id == IDLE_ID:
             if floor == self.current_floor:
                 # Person is on the same floor, start moving in requested direction
                 self.set_state(direction)
@@ -174,229 +338,305 @@ class Lift:
                 if floor > self.current_floor:
                     # Need to go up to reach person
                     # If they want to go up too, just move up; otherwise go up to pick them up first
-                    self.state = self.moving_up_state if direction == 'U' else self.moving_up_to_pick_first
+                    self._switch_state(MOVING_UP_ID if direction == UP else UP_PICK_FIRST_ID)
                 else:
                     # Need to go down to reach person
                     # If they want to go down too, just move down; otherwise go down to pick them up first
-                    self.state = self.moving_down_state if direction == 'D' else self.moving_down_to_pick_first
+                    self._switch_state(MOVING_DOWN_ID if direction == DOWN else DOWN_PICK_FIRST_ID)
         
         # Add the floor to our pickup set
-        self.incoming_requests_count.add(floor)
-
-    def add_outgoing_request(self, floor, direction):
+        self.incoming_requests_count |= 1 << floor
+        self._state_version += 1
+        
+        # Keep the pick-first target on the highest/lowest pickup. Pickups are only cleared
+        # by the normal moving states, so a new request is the only way the target can change.
+        state_id = self.state_id
+        if state_id == UP_PICK_FIRST_ID:
+            if floor > self.pick_target:
+                self.pick_target = floor
+        elif state_id == DOWN_PICK_FIRST_ID:
+            if self.pick_target < 0 or floor < self.pick_target:
+                self.pick_target = floor
+
+    def get_incoming_floors(self) -> list[int]:
+        """Returns the floors with a pickup request, in ascending order"""
+        incoming = self.incoming_requests_count
+        return [f for f in range(self.floors) if incoming >> f & 1]
+
+    def add_outgoing_request(self, floor: int, direction: int) -> None:
         """
         Registers a dropoff request (someone inside the lift wants to go to a floor).
         
         Args:
             floor (int): Destination floor
-            direction (str): Current direction of travel ('U' or 'D')
+            direction (int): Current direction of travel (UP, DOWN or IDLE)
         """
+        # Ignore buttons for floors outside the building; a negative floor would
+        # otherwise wrap around the array and stall the Fenwick update
+        if not 0 <= floor < self.floors:
+            return
         # Increment the count of people going to this floor
         self.outgoing_requests_count[floor] += 1
+        self._people_total += 1
+        self._bit_update(floor, 1)
+        self._state_version += 1
+
+    def drop_off(self, floor: int) -> int:
+        """Removes every passenger whose destination is the given floor and returns how many left"""
+        # A lift that overshoots the building has nobody to drop there
+        if not 0 <= floor < self.floors:
+            return 0
+        count = self.outgoing_requests_count[floor]
+        if count:
+            self.outgoing_requests_count[floor] = 0
+            self._people_total -= count
+            self._bit_update(floor, -count)
+        return count
+
+    def count_people_above(self, floor: int) -> int:
+        """Returns the number of people going to floors strictly above the given floor"""
+        total = self._people_total
+        # Empty lift or no floor above: skip the tree walk
+        if not total or floor >= self.floors - 1:
+            return 0
+        return total - self._bit_prefix(floor)
 
-    def count_people(self, floor, direction):
+    def count_people_below(self, floor: int) -> int:
+        """Returns the number of people going to floors strictly below the given floor"""
+        # Empty lift or no floor below: skip the tree walk
+        if not self._people_total or floor <= 0:
+            return 0
+        return self._bit_prefix(floor - 1)
+
+    def _bit_prefix(self, floor: int) -> int:
+        """Returns the number of people going to floors at or below the given floor"""
+        i = min(floor + 1, self.floors)
+        total = 0
+        while i > 0:
+            total += self._bit[i]
+            i &= i - 1  # Drop the lowest set bit to move to the parent range
+        return total
+
+    def _bit_update(self, floor: int, delta: int) -> None:
+        """Adds delta to the Fenwick tree entry for the given floor"""
+        i = floor + 1
+        while i <= self.floors:
+            self._bit[i] += delta
+            i += i & -i
+
+    def count_people(self, floor: int, direction: int) -> int:
         """
         Counts the number of people who would be in the lift when it reaches the given floor.
         Used to check if the lift would be full.
         
         Args:
             floor (int): The floor to check
-            direction (str): The direction of movement
+            direction (int): The direction of movement
             
         Returns:
             int: Number of people who would be in the lift
         """
-        return self.state.count_people(floor, direction)
-
-    def get_move_direction(self):
-        """Returns current direction of movement: 'U' (up), 'D' (down), or 'I' (idle)"""
-        return self.state.get_direction()
-
-    def get_current_floor(self):
-        """Returns the current floor number"""
-        return self.current_floor
+        return COUNT_FNS[self.state_id](self, floor, direction)
 
-    def tick(self):
+    def tick(self) -> None:
         """
         Advances the lift by one time unit.
-        Delegates to the current state to handle movement logic.
+        Delegates to the current state to handle movement logic,
+        including the switch to idle once all requests are served.
         """
+        state_id = self.state_id
+        # An idle lift does not move, so there is nothing to update
+        if state_id == IDLE_ID:
+            return
         # Let the current state handle the movement logic
-        self.state.tick()
+        TICK_FNS[state_id](self)
+        self._state_version += 1
+
+    def advance(self, ticks: int) -> None:
+        """
+        Advances the lift by several time units, stopping early once it goes idle.
         
-        # If no more requests, go to idle state
-        if not self.outgoing_requests_count and not self.incoming_requests_count:
-            self.set_state('I')
+        Args:
+            ticks (int): Number of time units to advance
+        """
+        if ticks <= 0 or self.state_id == IDLE_ID:
+            return
+        tick_fns = TICK_FNS
+        for _ in range(ticks):
+            state_id = self.state_id
+            if state_id == IDLE_ID:
+                break
+            tick_fns[state_id](self)
+        self._state_version += 1
 
-    def set_state(self, direction):
+    def set_state(self, direction: int) -> None:
         """
         Changes the lift's state based on direction.
         
         Args:
-            direction (str): 'U' for up, 'D' for down, 'I' for idle
+            direction (int): UP, DOWN or IDLE
         """
-        if direction == 'U':
-            self.state = self.moving_up_state
-        elif direction == 'D':
-            self.state = self.moving_down_state
+        if direction == UP:
+            self._switch_state(MOVING_UP_ID)
+        elif direction == DOWN:
+            self._switch_state(MOVING_DOWN_ID)
         else:
-            self.state = self.idle_state
+            self._switch_state(IDLE_ID)
 
-    def set_current_floor(self, current_floor):
-        """Updates the lift's current floor position"""
-        self.current_floor = current_floor
+    def _switch_state(self, state_id: int) -> None:
+        """Moves the lift to the given state id, keeping the controller's idle count in step"""
+        controller = self.controller
+        if controller is not None and (self.state_id == IDLE_ID) != (state_id == IDLE_ID):
+            controller._idle_count += 1 if state_id == IDLE_ID else -1
+        self.state_id = state_id
 
 
 class LiftState:
     """
     Base class for all lift states using the State pattern.
     Defines the interface for all concrete lift states.
+    States hold no data of their own: one shared instance per state serves every lift,
+    and the lift is passed to each method.
     """
-    def __init__(self, lift):
-        self.lift = lift  # Reference to the lift this state belongs to
-
-    def get_direction(self):
+    def get_direction(self) -> int:
         """Returns the movement direction in this state"""
-        return 'I'  # Default is idle
+        return IDLE  # Default is idle
 
-    def get_time_to_reach_floor(self, floor, direction):
+    def get_time_to_reach_floor(self, lift: Lift, floor: int, direction: int) -> int:
         """Calculates time to reach a floor in this state"""
         return 0  # Default implementation
 
-    def count_people(self, floor, direction):
+    def count_people(self, lift: Lift, floor: int, direction: int) -> int:
         """Estimates people count at a specific floor"""
         return 0  # Default implementation
 
-    def tick(self):
+    def tick(self, lift: Lift) -> None:
         """Handles one time unit of movement in this state"""
         pass  # Default does nothing
 
 
-class MovingUpState(LiftState):
+class MovingState(LiftState):
+    """
+    Shared behaviour of the two normal moving states.
+    Both move one floor per tick in their direction; only the sign of the step differs.
+    """
+    def tick(self, lift: Lift) -> None:
+        """
+        Handle one time unit of movement:
+        1. Clear any pickup requests at current floor
+        2. Move one floor in the current direction
+        3. Drop off any passengers at the new floor
+        4. Go idle if no requests remain
+        """
+        current_floor = lift.current_floor
+        
+        # Remove current floor from pickup requests. A lift that overshot the
+        # building has no pickup bit there (and a negative shift would raise).
+        incoming = lift.incoming_requests_count
+        if 0 <= current_floor < lift.floors:
+            incoming &= ~(1 << current_floor)
+            lift.incoming_requests_count = incoming
+        
+        # Nothing left to serve, so stop here
+        if not incoming and not lift._people_total:
+            lift.set_state(IDLE)
+            return
+            
+        # Move one floor in the current direction
+        current_floor += self.get_direction()
+        lift.current_floor = current_floor
+        
+        # Drop off passengers at this floor (if any). Something was left to serve before
+        # the move and pickups are unchanged since, so only a drop-off can empty the lift.
+        if lift.drop_off(current_floor) and not incoming and not lift._people_total:
+            lift.set_state(IDLE)
+
+
+class MovingUpState(MovingState):
     """
     State representing a lift moving upward serving normal requests.
     The lift is already carrying passengers or responding to pickup requests above.
     """
-    def get_direction(self):
-        return 'U'  # Lift is moving up
+    def get_direction(self) -> int:
+        return UP  # Lift is moving up
 
-    def get_time_to_reach_floor(self, floor, direction):
+    def get_time_to_reach_floor(self, lift: Lift, floor: int, direction: int) -> int:
         """
         Calculate time to reach the requested floor when moving up.
         Only accepts UP requests from floors above the current position.
         
         Args:
             floor (int): Target floor
-            direction (str): Requested direction ('U' or 'D')
+            direction (int): Requested direction (UP or DOWN)
             
         Returns:
             int: Time to reach or -1 if cannot service
         """
         # Only service UP requests from floors above current position
-        if direction != 'U' or floor < self.lift.get_current_floor():
+        if direction != UP or floor < lift.current_floor:
             return -1
         
         # Time equals number of floors to travel
-        return floor - self.lift.get_current_floor()
+        return floor - lift.current_floor
 
-    def count_people(self, floor, direction):
+    def count_people(self, lift: Lift, floor: int, direction: int) -> int:
         """
         When moving up, count passengers going to floors above the requested floor.
         This helps determine if the lift would be full by the time it reaches the requested floor.
         """
-        if direction != 'U':
+        if direction != UP:
             return 0
             
         # Count people going to floors above the target floor
-        return sum(v for f, v in self.lift.outgoing_requests_count.items() if f > floor)
-
-    def tick(self):
-        """
-        Handle one time unit of upward movement:
-        1. Clear any pickup requests at current floor
-        2. Move up one floor
-        3. Drop off any passengers at the new floor
-        """
-        # Remove current floor from pickup requests
-        self.lift.incoming_requests_count.discard(self.lift.get_current_floor())
-        
-        # Check if we should transition to idle
-        if not self.lift.incoming_requests_count and not self.lift.outgoing_requests_count:
-            return
-            
-        # Move up one floor
-        self.lift.set_current_floor(self.lift.get_current_floor() + 1)
-        
-        # Drop off passengers at this floor (if any)
-        self.lift.outgoing_requests_count.pop(self.lift.get_current_floor(), None)
+        return lift.count_people_above(floor)
 
 
-class MovingDownState(LiftState):
+class MovingDownState(MovingState):
     """
     State representing a lift moving downward serving normal requests.
     The lift is already carrying passengers or responding to pickup requests below.
     """
-    def get_direction(self):
-        return 'D'  # Lift is moving down
+    def get_direction(self) -> int:
+        return DOWN  # Lift is moving down
 
-    def get_time_to_reach_floor(self, floor, direction):
+    def get_time_to_reach_floor(self, lift: Lift, floor: int, direction: int) -> int:
         """
         Calculate time to reach the requested floor when moving down.
         Only accepts DOWN requests from floors below the current position.
         """
         # Only service DOWN requests from floors below current position
-        if direction != 'D' or floor > self.lift.get_current_floor():
+        if direction != DOWN or floor > lift.current_floor:
             return -1
             
         # Time equals number of floors to travel
-        return self.lift.get_current_floor() - floor
+        return lift.current_floor - floor
 
-    def count_people(self, floor, direction):
+    def count_people(self, lift: Lift, floor: int, direction: int) -> int:
         """
         When moving down, count passengers going to floors below the requested floor.
         This helps determine if the lift would be full by the time it reaches the requested floor.
         """
-        if direction != 'D':
+        if direction != DOWN:
             return 0
             
         # Count people going to floors below the target floor
-        return sum(v for f, v in self.lift.outgoing_requests_count.items() if f < floor)
-
-    def tick(self):
-        """
-        Handle one time unit of downward movement:
-        1. Clear any pickup requests at current floor
-        2. Move down one floor
-        3. Drop off any passengers at the new floor
-        """
-        # Remove current floor from pickup requests
-        self.lift.incoming_requests_count.discard(self.lift.get_current_floor())
-        
-        # Check if we should transition to idle
-        if not self.lift.incoming_requests_count and not self.lift.outgoing_requests_count:
-            return
-            
-        # Move down one floor
-        self.lift.set_current_floor(self.lift.get_current_floor() - 1)
-        
-        # Drop off passengers at this floor (if any)
-        self.lift.outgoing_requests_count.pop(self.lift.get_current_floor(), None)
+        return lift.count_people_below(floor)
 
 
 class IdleState(LiftState):
     """
     State representing a lift that is not moving and waiting for requests.
     """
-    def get_direction(self):
-        return 'I'  # Lift is idle
+    def get_direction(self) -> int:
+        return IDLE  # Lift is idle
 
-    def get_time_to_reach_floor(self, floor, direction):
+    def get_time_to_reach_floor(self, lift: Lift, floor: int, direction: int) -> int:
         """
         Calculate time to reach floor from idle state.
         An idle lift can accept any request and time is just the distance.
         """
         # Time is just the distance in floors (absolute difference)
-        return abs(floor - self.lift.get_current_floor())
+        return abs(floor - lift.current_floor)
 
 
 class MovingUpToPickFirstState(LiftState):
@@ -404,43 +644,40 @@ class MovingUpToPickFirstState(LiftState):
     Special state when lift is moving up to pick up a passenger who wants to go down.
     This is a transitional state - the lift will switch to moving down once it picks up the passenger.
     """
-    def get_direction(self):
-        return 'U'  # Currently moving up
+    def get_direction(self) -> int:
+        return UP  # Currently moving up
 
-    def get_time_to_reach_floor(self, floor, direction):
+    def get_time_to_reach_floor(self, lift: Lift, floor: int, direction: int) -> int:
         """
         Calculate time for a lift moving up to pick someone, then going back down.
         This is a more complex calculation because the lift will change direction.
         """
-        next_stop = self.next_stop()  # Find highest floor with a pickup request
+        next_stop = lift.pick_target  # Highest floor with a pickup request
         
         # Only handle DOWN calls from floors at or below the next pickup
-        if direction != 'D' or floor > next_stop:
+        if direction != DOWN or floor > next_stop:
             return -1
 
         # Compute total travel time in two legs:
         #  1) Leg-1: Rise from current floor up to the first pickup (next_stop)
         #  2) Leg-2: Then descend from next_stop back down to the caller's floor
         return (
-            next_stop - self.lift.get_current_floor()  # Time to go up to highest pickup
+            next_stop - lift.current_floor  # Time to go up to highest pickup
             + next_stop - floor  # Time to come back down to requested floor
         )
 
-    def next_stop(self):
-        """Find the highest floor with a pickup request - that's where we're heading"""
-        return max(self.lift.incoming_requests_count, default=-1)
-
-    def tick(self):
+    def tick(self, lift: Lift) -> None:
         """
         Move up one floor, and if we've reached our target pickup floor,
         switch to moving down state (since we're picking up passengers going down).
         """
         # Move up one floor
-        self.lift.set_current_floor(self.lift.get_current_floor() + 1)
+        lift.current_floor += 1
         
         # If we've reached the highest pickup request, switch to moving down
-        if self.lift.get_current_floor() == self.next_stop():
-            self.lift.set_state('D')
+        if lift.current_floor == lift.pick_target:
+            lift.pick_target = -1
+            lift.set_state(DOWN)
 
 
 class MovingDownToPickFirstState(LiftState):
@@ -448,45 +685,59 @@ class MovingDownToPickFirstState(LiftState):
     Special state when lift is moving down to pick up a passenger who wants to go up.
     This is a transitional state - the lift will switch to moving up once it picks up the passenger.
     """
-    def get_direction(self):
-        return 'D'  # Currently moving down
+    def get_direction(self) -> int:
+        return DOWN  # Currently moving down
 
-    def get_time_to_reach_floor(self, floor, direction):
+    def get_time_to_reach_floor(self, lift: Lift, floor: int, direction: int) -> int:
         """
         Calculate time for a lift moving down to pick someone, then going back up.
         This is a more complex calculation because the lift will change direction.
         """
-        next_stop = self.next_stop()  # Find lowest floor with a pickup request
+        next_stop = lift.pick_target  # Lowest floor with a pickup request
         
         # Only handle UP calls from floors at or above the next pickup
-        if direction != 'U' or floor < next_stop:
+        if direction != UP or floor < next_stop:
             return -1
             
         if next_stop < 0:
             next_stop = floor
             
         # Calculate time: first go down to lowest pickup, then back up to requested floor
-        return self.lift.get_current_floor() - next_stop + floor - next_stop
-
-    def next_stop(self):
-        """Find the lowest floor with a pickup request - that's where we're heading"""
-        return min(self.lift.incoming_requests_count, default=-1)
+        return lift.current_floor - next_stop + floor - next_stop
 
-    def tick(self):
+    def tick(self, lift: Lift) -> None:
         """
         Move down one floor, and if we've reached our target pickup floor,
         switch to moving up state (since we're picking up passengers going up).
         """
         # Move down one floor
-        self.lift.set_current_floor(self.lift.get_current_floor() - 1)
+        lift.current_floor -= 1
         
         # If we've reached the lowest pickup request, switch to moving up
-        if self.lift.get_current_floor() == self.next_stop():
-            self.lift.set_state('U')
+        if lift.current_floor == lift.pick_target:
+            lift.pick_target = -1
+            lift.set_state(UP)
+
+
+# Shared state instances (flyweights) used by every lift
+MOVING_UP_STATE = MovingUpState()  # Moving upward normally
+MOVING_DOWN_STATE = MovingDownState()  # Moving downward normally
+IDLE_STATE = IdleState()  # Not moving, waiting for requests
+UP_PICK_FIRST_STATE = MovingUpToPickFirstState()  # Going up to get first passenger
+DOWN_PICK_FIRST_STATE = MovingDownToPickFirstState()  # Going down to get first passenger
+
+# Dispatch tables indexed by state id. Calling a pre-bound method from a tuple skips the
+# attribute lookups that `lift.state.tick(lift)` would do on every call.
+STATES = (IDLE_STATE, MOVING_UP_STATE, MOVING_DOWN_STATE, UP_PICK_FIRST_STATE, DOWN_PICK_FIRST_STATE)
+STATE_DIRECTIONS = tuple(state.get_direction() for state in STATES)
+TICK_FNS = tuple(state.tick for state in STATES)
+TIME_FNS = tuple(state.get_time_to_reach_floor for state in STATES)
+COUNT_FNS = tuple(state.count_people for state in STATES)
 
 
 # Test code for the elevator system
-if __name__ == "__main__":
+def _demo() -> None:
+    """Runs a short sample simulation and prints every lift after each tick"""
     # Initialize the system with 6 floors, 2 lifts, 10 people capacity per lift
     sol = Solution()
     sol.init(floors=6, lifts=2, lifts_capacity=10, helper=None)
@@ -500,11 +751,11 @@ if __name__ == "__main__":
     print("Lift states after request:")
     for i in range(sol.lifts_count):
         lift = sol.lifts[i]
-        print(f"  Lift {i}: floor={lift.get_current_floor()}, "
-              f"dir={lift.get_move_direction()}, "
-              f"people={lift.get_current_people_count()}, "
-              f"incoming={sorted(lift.incoming_requests_count)}, "
-              f"outgoing={dict(lift.outgoing_requests_count)}")
+        print(f"  Lift {i}: floor={lift.current_floor}, "
+              f"dir={DIRECTION_CHARS[STATE_DIRECTIONS[lift.state_id]]}, "
+              f"people={lift.people_count}, "
+              f"incoming={lift.get_incoming_floors()}, "
+              f"outgoing={dict((f, n) for f, n in enumerate(lift.outgoing_requests_count) if n)}")
 
     # Simulate the system running for up to 5 time units
     target_floor = 5
@@ -517,13 +768,17 @@ if __name__ == "__main__":
         print(f"\nAfter tick #{t}:")
         for i in range(sol.lifts_count):
             lift = sol.lifts[i]
-            print(f"  Lift {i}: floor={lift.get_current_floor()}, "
-                  f"dir={lift.get_move_direction()}, "
-                  f"people={lift.get_current_people_count()}, "
-                  f"incoming={sorted(lift.incoming_requests_count)}, "
-                  f"outgoing={dict(lift.outgoing_requests_count)}")
+            print(f"  Lift {i}: floor={lift.current_floor}, "
+                  f"dir={DIRECTION_CHARS[STATE_DIRECTIONS[lift.state_id]]}, "
+                  f"people={lift.people_count}, "
+                  f"incoming={lift.get_incoming_floors()}, "
+                  f"outgoing={dict((f, n) for f, n in enumerate(lift.outgoing_requests_count) if n)}")
                   
         # Stop simulation if any lift has reached the target floor
-        if any(l.get_current_floor() == target_floor for l in sol.lifts):
+        if any(l.current_floor == target_floor for l in sol.lifts):
             print(f"\n→ A lift reached floor {target_floor} on tick #{t}")
             break
+
+
+if __name__ == "__main__":
+    _demo()
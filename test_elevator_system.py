@@ -0,0 +1,202 @@
+# Regression tests for the elevator system.
+# Run with: python -m unittest
+
+import unittest
+
+from elevator_system import Solution
+
+TICK = ("tick",)
+
+
+def play(floors, lifts, capacity, operations):
+    """
+    Runs a sequence of operations on a fresh system.
+
+    Args:
+        floors, lifts, capacity: Arguments for Solution.init
+        operations: ("request", floor, direction), ("press", lift_index, floor) or TICK
+
+    Returns:
+        list: The lift index returned by each request and, after each tick,
+              the states of all lifts joined by spaces
+    """
+    solution = Solution()
+    solution.init(floors, lifts, capacity, None)
+    results = []
+    for operation in operations:
+        if operation[0] == "request":
+            results.append(solution.request_lift(operation[1], operation[2]))
+        elif operation[0] == "press":
+            solution.press_floor_button_in_lift(operation[1], operation[2])
+        else:
+            solution.tick()
+            results.append(" ".join(solution.get_lift_state(i) for i in range(lifts)))
+    return results
+
+
+class RequestSequenceTest(unittest.TestCase):
+    """Expected outputs recorded from the original implementation"""
+    def test_pick_first_states(self):
+        results = play(10, 2, 4, [
+            ("request", 7, "D"), ("request", 2, "U"), TICK, TICK, ("request", 5, "D"),
+            TICK, TICK, TICK, TICK, TICK, ("press", 0, 1), TICK, TICK, TICK,
+        ])
+        self.assertEqual(results, [
+            0, 1, "1-U-0 1-U-0", "2-U-0 2-U-0", 0, "3-U-0 2-I-0", "4-U-0 2-I-0",
+            "5-U-0 2-I-0", "6-U-0 2-I-0", "7-D-0 2-I-0", "6-D-1 2-I-0",
+            "5-D-1 2-I-0", "4-D-1 2-I-0",
+        ])
+
+    def test_full_lift_is_skipped(self):
+        results = play(8, 2, 1, [
+            ("request", 3, "U"), TICK, TICK, TICK, ("press", 0, 7),
+            ("request", 5, "U"), ("request", 6, "U"), TICK, TICK, TICK, TICK,
+        ])
+        self.assertEqual(results, [
+            0, "1-U-0 0-I-0", "2-U-0 0-I-0", "3-U-0 0-I-0", 1, 1,
+            "4-U-1 1-U-0", "5-U-1 2-U-0", "6-U-1 3-U-0", "7-I-0 4-U-0",
+        ])
+
+
+    def test_nearest_lift_and_overshoot_below_ground(self):
+        results = play(10, 3, 2, [
+            ("request", 4, "U"), TICK, ("request", 0, "U"), TICK, TICK, TICK,
+            ("press", 0, 9), ("request", 2, "D"), TICK, TICK, ("press", 1, 5),
+            TICK, TICK, TICK, TICK, TICK,
+        ])
+        self.assertEqual(results, [
+            0, "1-U-0 0-I-0 0-I-0", 1, "2-U-0 0-I-0 0-I-0", "3-U-0 0-I-0 0-I-0",
+            "4-U-0 0-I-0 0-I-0", 1, "5-U-1 1-U-0 0-I-0", "6-U-1 2-D-0 0-I-0",
+            "7-U-1 1-D-1 0-I-0", "8-U-1 0-D-1 0-I-0", "9-I-0 -1-D-1 0-I-0",
+            "9-I-0 -2-D-1 0-I-0", "9-I-0 -3-D-1 0-I-0",
+        ])
+
+    def test_overshoot_above_top_floor(self):
+        results = play(6, 2, 3, [
+            ("request", 5, "U"), ("request", 1, "U"), TICK, ("press", 0, 3),
+            TICK, TICK, TICK, TICK, ("press", 0, 0), TICK, TICK,
+        ])
+        self.assertEqual(results, [
+            0, 0, "1-U-0 0-I-0", "2-U-1 0-I-0", "3-U-0 0-I-0", "4-U-0 0-I-0",
+            "5-U-0 0-I-0", "6-U-1 0-I-0", "7-U-1 0-I-0",
+        ])
+
+
+    def test_burst_of_repeated_requests(self):
+        # Same floor and direction several times within one tick, with passengers
+        # boarding in between until the first lifts are full
+        results = play(10, 3, 2, [
+            ("request", 5, "U"), ("request", 5, "U"), ("press", 0, 9), ("request", 5, "U"),
+            ("press", 1, 8), ("request", 5, "U"), ("press", 0, 7), ("request", 5, "U"),
+            ("request", 5, "U"), ("request", 3, "D"), ("press", 2, 1), ("request", 3, "D"),
+            ("request", 3, "D"), TICK, ("request", 5, "U"), ("request", 5, "U"), TICK, TICK,
+        ])
+        self.assertEqual(results, [
+            0, 0, 0, 0, 1, 1, 2, 2, 2, "1-U-2 1-U-1 1-U-1", 1, 1,
+            "2-U-2 2-U-1 2-U-1", "3-U-2 3-U-1 3-D-1",
+        ])
+
+
+class BalanceWeightTest(unittest.TestCase):
+    """balance_weight charges each passenger aboard as extra ticks when picking a lift"""
+    def pick_for_floor_3(self, balance_weight):
+        """
+        Lift 0 carries one passenger and is 2 floors from floor 3, lift 1 is empty
+        and idle 3 floors away. Returns the lift picked for an UP call at floor 3.
+        """
+        solution = Solution()
+        solution.init(10, 2, 10, None, balance_weight)
+        self.assertEqual(solution.request_lift(0, "U"), 0)
+        solution.press_floor_button_in_lift(0, 9)
+        solution.tick()
+        return solution.request_lift(3, "U")
+
+    def test_zero_weight_picks_fastest_lift(self):
+        self.assertEqual(self.pick_for_floor_3(0), 0)
+
+    def test_weight_spreads_calls_to_emptier_lift(self):
+        self.assertEqual(self.pick_for_floor_3(2), 1)
+
+    def test_negative_weight_prefers_fuller_lift(self):
+        self.assertEqual(self.pick_for_floor_3(-5), 0)
+
+class OvershootTest(unittest.TestCase):
+    """
+    A lift that keeps a direction nobody inside it can use runs past the end of the building.
+    Those floors have no pickup bit or drop-off slot, so the lift must keep moving without
+    raising, exactly like the original set/dict based lift did.
+    """
+    def run_ticks(self, solution, ticks):
+        """Ticks the system and returns the first lift's state after each tick"""
+        states = []
+        for _ in range(ticks):
+            solution.tick()
+            states.append(solution.get_lift_state(0))
+        return states
+
+    def test_runs_below_ground_floor(self):
+        solution = Solution()
+        solution.init(6, 1, 10, None)
+        self.assertEqual(solution.request_lift(0, "D"), 0)
+        solution.press_floor_button_in_lift(0, 3)
+        self.assertEqual(self.run_ticks(solution, 3), ["-1-D-1", "-2-D-1", "-3-D-1"])
+
+    def test_runs_above_top_floor(self):
+        solution = Solution()
+        solution.init(6, 1, 10, None)
+        self.assertEqual(solution.request_lift(5, "U"), 0)
+        self.assertEqual(self.run_ticks(solution, 5), ["1-U-0", "2-U-0", "3-U-0", "4-U-0", "5-U-0"])
+        solution.press_floor_button_in_lift(0, 2)
+        self.assertEqual(self.run_ticks(solution, 3), ["6-U-1", "7-U-1", "8-U-1"])
+
+    def test_request_outside_building_is_refused(self):
+        solution = Solution()
+        solution.init(6, 1, 10, None)
+        self.assertEqual(solution.request_lift(-1, "U"), -1)
+        self.assertEqual(solution.request_lift(9, "D"), -1)
+        solution.tick()
+        self.assertEqual(solution.get_lift_state(0), "0-I-0")
+
+
+class TickManyTest(unittest.TestCase):
+    """tick_many(k) must leave every lift exactly where k calls to tick() do"""
+    def assert_same_as_ticks(self, floors, lifts, operations):
+        """
+        Runs the operations on two systems, one ticking one unit at a time and
+        one using tick_many, and compares all lift states after each batch.
+
+        Args:
+            operations: ("request", floor, direction), ("press", lift_index, floor)
+                        or ("ticks", count)
+        """
+        stepped, batched = Solution(), Solution()
+        stepped.init(floors, lifts, 4, None)
+        batched.init(floors, lifts, 4, None)
+        for operation in operations:
+            if operation[0] == "request":
+                self.assertEqual(batched.request_lift(operation[1], operation[2]),
+                                 stepped.request_lift(operation[1], operation[2]))
+            elif operation[0] == "press":
+                stepped.press_floor_button_in_lift(operation[1], operation[2])
+                batched.press_floor_button_in_lift(operation[1], operation[2])
+            else:
+                for _ in range(operation[1]):
+                    stepped.tick()
+                batched.tick_many(operation[1])
+                self.assertEqual([batched.get_lift_state(i) for i in range(lifts)],
+                                 [stepped.get_lift_state(i) for i in range(lifts)])
+
+    def test_pick_first_and_go_idle(self):
+        self.assert_same_as_ticks(10, 2, [
+            ("request", 7, "D"), ("request", 2, "U"), ("ticks", 2), ("request", 5, "D"),
+            ("ticks", 5), ("press", 0, 1), ("ticks", 3), ("ticks", 10), ("ticks", 0),
+        ])
+
+    def test_overshoot(self):
+        self.assert_same_as_ticks(6, 2, [
+            ("request", 0, "D"), ("press", 0, 3), ("ticks", 4),
+            ("request", 5, "U"), ("ticks", 5), ("press", 1, 2), ("ticks", 3),
+        ])
+
+if __name__ == "__main__":
+    unittest.main()